@@ -6,8 +6,15 @@ Compare criterion benchmark results across multiple allocators.
 # Thanks to Claude (Opus 4.5) for writing and updating this to my specifications.
 
 import argparse
+import bisect
+import functools
+import hashlib
+import json
 import re
-from collections import defaultdict
+import stat
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -28,50 +35,186 @@ WEIGHTS = {
 
 DEFAULT_WEIGHT = 100
 
+# One alternation over all prefixes; like the old loop, the first listed prefix wins
+_WEIGHT_PREFIX_RE = re.compile('|'.join(re.escape(prefix) for prefix in WEIGHTS))
+
+# Seconds per unit as printed by criterion. This runs over the raw bytes of the
+# file, so "µ" is spelled as its UTF-8 encoding (\xc2\xb5); logs that went
+# through a Latin-1 round trip spell it "Âµ" (\xc3\x82\xc2\xb5).
+_UNIT_MULTIPLIERS = {
+    b'ns': 1e-9,
+    b'us': 1e-6,
+    'µs'.encode(): 1e-6,
+    'Âµs'.encode(): 1e-6,
+    b'ms': 1e-3,
+    b's': 1,
+}
+
+# Match lines like: "test_name time: [1.2345 µs 1.2456 µs 1.2567 µs]"
+# The middle value is the median/point estimate. Names too long for criterion's
+# column are printed on their own line; \s+ spans that newline too.
+# Units are spelled out rather than matched with a character class, so nonsense
+# like "mmms" is rejected and no two adjacent repeats can backtrack into each other.
+_UNIT_PATTERN = b'(?:' + b'|'.join(re.escape(unit) for unit in _UNIT_MULTIPLIERS) + b')'
+_NUMBER_PATTERN = rb'\d+(?:\.\d+)?'
+_TIME_LINE_RE = re.compile(
+    rb'(?m)^(\S+)\s+time:\s+\[' + _NUMBER_PATTERN + rb'\s+' + _UNIT_PATTERN
+    + rb'\s+(' + _NUMBER_PATTERN + rb')\s+(' + _UNIT_PATTERN + rb')\b'
+)
+
+_SVG_STYLE = '''  <style>
+    .title { font-family: Arial, Helvetica, sans-serif; font-size: 18px; font-weight: bold; fill: #333333; }
+    .axis-label { font-family: Arial, Helvetica, sans-serif; font-size: 12px; fill: #666666; }
+    .tick-label { font-family: Arial, Helvetica, sans-serif; font-size: 11px; fill: #666666; }
+    .bar-label-name { font-family: Arial, Helvetica, sans-serif; font-size: 12px; fill: #333333; }
+    .bar-label-value { font-family: monospace; font-size: 11px; fill: #555555; }
+    .bar-label-pct { font-family: Arial, Helvetica, sans-serif; font-size: 12px; font-weight: bold; fill: white; }
+    .metadata { font-family: monospace; font-size: 10px; fill: #666666; }
+    .grid-line { stroke: #cccccc; stroke-width: 0.5; }
+  </style>
+'''
+
+# Per-bar fragments: path, allocator name below the bar, time label above it.
+# Like every other coordinate in the chart, these are written in whole pixels.
+_SVG_BAR_TEMPLATE = (
+    '  <path d="%s" fill="%s"/>\n'
+    '  <text x="%.0f" y="%s" class="bar-label-name" text-anchor="middle">%s</text>\n'
+    '  <text x="%.0f" y="%.0f" class="bar-label-value" text-anchor="middle">%s</text>\n'
+)
+# Percentage label drawn inside bars that are tall enough to hold it
+_SVG_BAR_PCT_TEMPLATE = '  <text x="%.0f" y="%.0f" class="bar-label-pct" text-anchor="middle">%s</text>\n'
+
+@functools.lru_cache(maxsize=None)
 def get_weight(test_name: str) -> int:
     """Get the weight for a test based on its name prefix."""
-    for prefix, weight in WEIGHTS.items():
-        if test_name.startswith(prefix):
-            return weight
-    return DEFAULT_WEIGHT
+    match = _WEIGHT_PREFIX_RE.match(test_name)
+    return WEIGHTS[match.group()] if match else DEFAULT_WEIGHT
+
+# Extensions stripped from result filenames to get the allocator name
+_RESULT_SUFFIXES = ('.txt', '.bench')
+
+def get_allocator_name(filepath: str) -> str:
+    """Extract the allocator name from a results filename (e.g., "tmp/default" -> "default")."""
+    name = os.path.basename(filepath)
+    while name.endswith(_RESULT_SUFFIXES):
+        name = name.rpartition('.')[0]
+    return name
+
+# Parsed results are cached here, one entry per log, named by a hash of its path.
+# Each entry records the version, mtime and size it was parsed at; bump
+# _CACHE_VERSION whenever parsing changes so stale entries are ignored.
+_CACHE_VERSION = 1
+# Oldest entries beyond this many are dropped whenever a new log is added
+_CACHE_MAX_ENTRIES = 1000
+
+def _cache_dir() -> Path:
+    """Return the cache directory; raises RuntimeError if there is no home directory."""
+    # The XDG spec says relative paths are invalid and must be ignored
+    xdg_cache_home = os.environ.get('XDG_CACHE_HOME', '')
+    if os.path.isabs(xdg_cache_home):
+        return Path(xdg_cache_home) / 'critcmp'
+    return Path.home() / '.cache' / 'critcmp'
 
 def parse_file(filename: str) -> dict[str, float]:
-    """Parse a Criterion benchmark output file and return {test_name: time_in_seconds}."""
-    results = {}
-    with open(filename, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Match lines like: "test_name time: [1.2345 µs 1.2456 µs 1.2567 µs]"
-    # The middle value is the median/point estimate
-    pattern = r'^(\S+)\s+time:\s+\[[\d.]+ [µnms]+\s+([\d.]+)\s+([µnms]+)'
+    """Parse a Criterion benchmark output file and return {test_name: time_in_seconds}.
+
+    Results are cached on disk, so re-running on unchanged files skips the scan.
+    """
+    st = os.stat(filename)
+    # Pipes such as /dev/stdin or <(...) have no stable identity to key on
+    if not stat.S_ISREG(st.st_mode):
+        return _scan_file(filename)
+
+    stamp = [_CACHE_VERSION, st.st_mtime_ns, st.st_size]
+    path_hash = hashlib.blake2b(os.path.realpath(filename).encode(), digest_size=16).hexdigest()
+
+    cache_file = None
+    is_new_entry = False
+    try:
+        cache_file = _cache_dir() / f"{path_hash}.json"
+        cached_stamp, cached_results = json.loads(cache_file.read_text(encoding='utf-8'))
+        if cached_stamp == stamp:
+            return cached_results
+    except FileNotFoundError:
+        is_new_entry = True
+    except (OSError, RuntimeError, TypeError, ValueError):
+        pass
+
+    results = _scan_file(filename)
+
+    # No cache directory could be resolved, so there is nowhere to save them
+    if cache_file is None:
+        return results
+
+    # The cache is best effort: any failure just means parsing again next time
+    cache_dir = cache_file.parent
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump([stamp, results], f)
+            os.replace(tmp_name, cache_file)
+        except OSError:
+            # _prune_cache only looks at *.json, so nothing else would remove it
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        # Rewriting a known log replaces its entry, so only new logs can grow the cache
+        if is_new_entry:
+            _prune_cache(cache_dir)
+    except OSError:
+        pass
 
-    for match in re.finditer(pattern, content, re.MULTILINE):
-        test_name = match.group(1)
-        median_value = float(match.group(2))
-        unit = match.group(3)
+    return results
 
-        # Convert to seconds
-        multipliers = {'ns': 1e-9, 'µs': 1e-6, 'ms': 1e-3, 's': 1}
-        time_seconds = median_value * multipliers.get(unit, 1)
-        results[test_name] = time_seconds
+def _prune_cache(cache_dir: Path):
+    """Keep only the _CACHE_MAX_ENTRIES most recently written cache entries."""
+    entries = list(cache_dir.glob('*.json'))
+    if len(entries) <= _CACHE_MAX_ENTRIES:
+        return
+    entries.sort(key=lambda p: p.stat().st_mtime_ns, reverse=True)
+    for stale in entries[_CACHE_MAX_ENTRIES:]:
+        # Another parse may be pruning concurrently
+        stale.unlink(missing_ok=True)
+
+def _scan_file(filename: str) -> dict[str, float]:
+    """Scan a Criterion benchmark output file for time: lines."""
+    with open(filename, 'rb') as f:
+        content = f.read()
 
-    return results
+    # Progress text overwritten with a bare \r in terminal captures ends a line
+    # too, as it did when the file was read with universal newlines. Most logs
+    # have none, so skip copying the whole file for them.
+    if b'\r' in content:
+        content = content.replace(b'\r', b'\n')
+
+    # One scan over the whole file; per-line Python work costs more than the regex
+    return {
+        test_name.decode('utf-8'): float(median_value) * _UNIT_MULTIPLIERS[unit]
+        for test_name, median_value, unit in _TIME_LINE_RE.findall(content)
+    }
+
+# Lower bound in seconds of each unit after ns, ascending
+_TIME_UNIT_BOUNDS = (0.000001, 0.001, 1)
+# (multiplier, suffix, decimals) for ns, µs, ms and s
+_TIME_UNITS = (
+    (1_000_000_000, "ns", 1),
+    (1_000_000, "µs", 2),
+    (1000, "ms", 2),
+    (1, "s", 2),
+)
 
 def format_time(seconds: float) -> str:
     """Format time in appropriate units."""
-    if seconds >= 1:
-        return f"{seconds:.2f}s"
-    elif seconds >= 0.001:
-        return f"{seconds * 1000:.2f}ms"
-    elif seconds >= 0.000001:
-        return f"{seconds * 1_000_000:.2f}µs"
-    else:
-        return f"{seconds * 1_000_000_000:.1f}ns"
+    multiplier, suffix, decimals = _TIME_UNITS[bisect.bisect_right(_TIME_UNIT_BOUNDS, seconds)]
+    return f"{seconds * multiplier:.{decimals}f}{suffix}"
 
 def format_time_fixed_width(seconds: float, width: int = 8) -> str:
     """Format time in milliseconds with 1 decimal place, fixed width."""
-    ms = seconds * 1000
-    return f"{ms:.1f}".rjust(width)
+    return f"{seconds * 1000:{width}.1f}"
 
 def format_diff(baseline: float, current: float) -> str:
     """Format the percentage difference from baseline."""
@@ -79,16 +222,13 @@ def format_diff(baseline: float, current: float) -> str:
         return "(  N/A )"
     diff_pct = ((current - baseline) / baseline) * 100
     rounded_pct = round(diff_pct)
-    if rounded_pct > 0:
-        return f"({rounded_pct:+4d}%)"
-    elif rounded_pct < 0:
-        return f"({rounded_pct:+4d}%)"
-    else:
+    if rounded_pct == 0:
         return "(   0%)"
+    return f"({rounded_pct:+4d}%)"
 
-def format_pct_diff(ratio: float) -> str:
-    """Format percentage difference from baseline for graph labels."""
-    pct_diff = (ratio - 1.0) * 100
+def format_pct_diff(pct: float) -> str:
+    """Format percentage difference from baseline for graph labels, given pct of baseline."""
+    pct_diff = pct - 100.0
     if abs(pct_diff) < 0.5:
         return "0%"
     elif pct_diff > 0:
@@ -98,15 +238,24 @@ def format_pct_diff(ratio: float) -> str:
 
 def rounded_rect_path(x: float, y: float, width: float, height: float, radius: float) -> str:
     """Generate SVG path for rectangle with only top corners rounded."""
-    r = min(radius, width / 2, height / 2)
+    if width >= 2 * radius and height >= 2 * radius:
+        # Usual case: the bar is big enough for the full corner radius
+        r = radius
+    else:
+        r = min(radius, width / 2, height / 2)
+    right = x + width
+    bottom = y + height
+    corner_y = y + r
+    arc = f"A{r:.0f} {r:.0f} 0 0 0"
+    # Whole pixels are enough for the chart, and the compact path syntax keeps it short
     return (
-        f"M {x} {y + height}"
-        f" L {x + width} {y + height}"
-        f" L {x + width} {y + r}"
-        f" A {r} {r} 0 0 0 {x + width - r} {y}"
-        f" L {x + r} {y}"
-        f" A {r} {r} 0 0 0 {x} {y + r}"
-        f" Z"
+        f"M{x:.0f} {bottom:.0f}"
+        f"L{right:.0f} {bottom:.0f}"
+        f"L{right:.0f} {corner_y:.0f}"
+        f"{arc} {right - r:.0f} {y:.0f}"
+        f"L{x + r:.0f} {y:.0f}"
+        f"{arc} {x:.0f} {corner_y:.0f}"
+        f"Z"
     )
 
 def print_results(allocators: list[str], all_results: dict[str, dict[str, float]], 
@@ -129,106 +278,109 @@ def print_results(allocators: list[str], all_results: dict[str, dict[str, float]
     diff_width = 7
     col_width = time_width + 1 + diff_width
 
+    # Row templates, built once instead of re-parsing the format specs per cell
+    label_fmt = f"{{:<{max_test_len}}}  {{:>{weight_width}}}".format
+    cell_fmt = "  {} {}".format
+    missing_cell = f"  {'N/A':>{time_width}} {'':>{diff_width}}"
+
+    # Collect the report and write it in one go
+    lines: list[str] = []
+
     # Print header
-    print()
+    lines.append("")
 
     # Allocator names row
-    header1 = " " * (max_test_len + 2) + " " * (weight_width + 2)
-    for alloc in allocators:
-        header1 += f"{alloc:^{col_width}}  "
-    print(header1)
+    header1 = [" " * (max_test_len + 2) + " " * (weight_width + 2)]
+    header1.extend(f"{alloc:^{col_width}}  " for alloc in allocators)
+    lines.append("".join(header1))
 
     # Separator row
     header2 = " " * (max_test_len + 2) + " " * (weight_width + 2)
-    for _ in allocators:
-        header2 += "-" * col_width + "  "
-    print(header2)
+    lines.append(header2 + ("-" * col_width + "  ") * len(allocators))
 
     # Column labels row
     header3 = f"{'test':<{max_test_len}}  {'weight':>{weight_width}}"
-    for _ in allocators:
-         header3 += f"  {'time ms':>{time_width}} {'(diff%)':>{diff_width}}"
-    print(header3)
+    lines.append(header3 + f"  {'time ms':>{time_width}} {'(diff%)':>{diff_width}}" * len(allocators))
 
     # Underline row
     header4 = f"{'-' * 4:<{max_test_len}}  {'-' * weight_width:>{weight_width}}"
-    for _ in allocators:
-        header4 += f"  {'-' * time_width} {'-' * diff_width}"
-    print(header4)
+    lines.append(header4 + f"  {'-' * time_width} {'-' * diff_width}" * len(allocators))
 
     total_width = max_test_len + 2 + weight_width + len(allocators) * (2 + col_width)
 
-    # Track weighted sums
-    weighted_sums: dict[str, float] = defaultdict(float)
+    # Track weighted sums, one slot per allocator column
+    column_sums = [0.0] * len(allocators)
     test_count = 0
 
+    # Resolve each allocator's results once rather than per cell
+    columns = [all_results.get(alloc, {}) for alloc in allocators]
+    baseline_results = columns[0]
+    candidate_columns = list(enumerate(columns[1:], start=1))
+
     # Print each test row
     for test in sorted_tests:
         weight = get_weight(test)
 
-        # Check if baseline has this test
-        if test not in all_results.get(baseline_alloc, {}):
+        # Skip tests the baseline doesn't have
+        baseline_time = baseline_results.get(test)
+        if baseline_time is None:
             continue
 
-        baseline_time = all_results[baseline_alloc][test]
         baseline_weighted = baseline_time * weight
 
-        row = f"{test:<{max_test_len}}  {weight:>{weight_width}}"
+        # The baseline cell is always present, so emit it up front
+        column_sums[0] += baseline_weighted
+        row = [
+            label_fmt(test, weight),
+            cell_fmt(format_time_fixed_width(baseline_weighted, time_width), "( base)"),
+        ]
 
-        for alloc in allocators:
-            if test in all_results.get(alloc, {}):
-                raw_time = all_results[alloc][test]
+        for col, results in candidate_columns:
+            raw_time = results.get(test)
+            if raw_time is not None:
                 weighted_time = raw_time * weight
-                weighted_sums[alloc] += weighted_time
+                column_sums[col] += weighted_time
 
                 time_str = format_time_fixed_width(weighted_time, time_width)
-
-                if alloc == baseline_alloc:
-                    diff_str = "( base)"
-                else:
-                    diff_str = format_diff(baseline_weighted, weighted_time)
-
-                row += f"  {time_str} {diff_str}"
+                diff_str = format_diff(baseline_weighted, weighted_time)
+                row.append(cell_fmt(time_str, diff_str))
             else:
-                row += f"  {'N/A':>{time_width}} {'':>{diff_width}}"
+                row.append(missing_cell)
 
         test_count += 1
-        print(row)
+        lines.append("".join(row))
+
+    weighted_sums = dict(zip(allocators, column_sums))
 
     # Print summary
-    print("-" * total_width)
+    lines.append("-" * total_width)
+
+    # Each total and its diff from baseline is shared by the SUM row and the summary table
+    baseline_sum = column_sums[0]
+    sum_time_strs = [format_time_fixed_width(alloc_sum, time_width) for alloc_sum in column_sums]
+    sum_diff_strs = [format_diff(baseline_sum, alloc_sum) for alloc_sum in column_sums[1:]]
 
     # SUM row
-    sum_row = f"{'SUM':<{max_test_len}}  {'':{weight_width}}"
-    baseline_sum = weighted_sums.get(baseline_alloc, 0)
-    for alloc in allocators:
-        alloc_sum = weighted_sums[alloc]
-        time_str = format_time_fixed_width(alloc_sum, time_width)
-        if alloc == baseline_alloc:
-            diff_str = "( base)"
-        else:
-            diff_str = format_diff(baseline_sum, alloc_sum)
-        sum_row += f"  {time_str} {diff_str}"
-    print(sum_row)
-
-    print("-" * total_width)
-    print()
-    print(f"Tests compared: {test_count}")
-    print()
+    sum_row = [label_fmt('SUM', ''), cell_fmt(sum_time_strs[0], "( base)")]
+    sum_row.extend(map(cell_fmt, sum_time_strs[1:], sum_diff_strs))
+    lines.append("".join(sum_row))
+
+    lines.append("-" * total_width)
+    lines.append("")
+    lines.append(f"Tests compared: {test_count}")
+    lines.append("")
 
     # Final summary table
-    print(f"{'Allocator':<15} {'Weighted Sum':>12} vs Baseline")
-    print("-" * 15 + " " + "-" * 12 + " " + "-" * 11)
-    for alloc in allocators:
-        alloc_sum = weighted_sums[alloc]
-        time_str = format_time_fixed_width(alloc_sum, time_width)
-        if alloc == baseline_alloc:
-            diff_str = "   baseline"
-        else:
-            diff_str = "    " + format_diff(baseline_sum, alloc_sum)
-        print(f"{alloc:<15} {time_str:>12} {diff_str}")
-
-    return dict(weighted_sums)
+    summary_fmt = "{:<15} {:>12} {}".format
+    lines.append(summary_fmt('Allocator', 'Weighted Sum', 'vs Baseline'))
+    lines.append("-" * 15 + " " + "-" * 12 + " " + "-" * 11)
+    lines.append(summary_fmt(baseline_alloc, sum_time_strs[0], "   baseline"))
+    for alloc, time_str, diff_str in zip(allocators[1:], sum_time_strs[1:], sum_diff_strs):
+        lines.append(summary_fmt(alloc, time_str, "    " + diff_str))
+
+    sys.stdout.write("\n".join(lines) + "\n")
+
+    return weighted_sums
 
 def generate_graph(allocators: list[str], weighted_sums: dict[str, float], 
                    metadata_dict: dict, output_file: str, title_suffix: str = ''):
@@ -240,7 +392,8 @@ def generate_graph(allocators: list[str], weighted_sums: dict[str, float],
         print("Warning: Baseline has no data, skipping graph generation.")
         return
 
-    percentages = [(weighted_sums.get(a, 0) / baseline) * 100 for a in allocators]
+    pct_per_time = 100.0 / baseline
+    percentages = [weighted_sums.get(a, 0) * pct_per_time for a in allocators]
     baseline_time_str = format_time(baseline)
 
     # SVG dimensions
@@ -253,6 +406,8 @@ def generate_graph(allocators: list[str], weighted_sums: dict[str, float],
 
     chart_width = svg_width - margin_left - margin_right
     chart_height = svg_height - margin_top - margin_bottom
+    chart_bottom = margin_top + chart_height
+    chart_right = margin_left + chart_width
 
     n_allocators = len(allocators)
     bar_spacing = chart_width / n_allocators
@@ -262,73 +417,80 @@ def generate_graph(allocators: list[str], weighted_sums: dict[str, float],
     max_pct = max(percentages)
     y_max = max(max_pct * 1.15, 115)
 
-    svg_parts = ['<?xml version="1.0" encoding="UTF-8"?>']
-    svg_parts.append(f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {svg_width} {svg_height}" width="{svg_width}" height="{svg_height}">')
-    svg_parts.append(f'  <rect width="{svg_width}" height="{svg_height}" fill="white"/>')
-
-    svg_parts.append('''  <style>
-    .title { font-family: Arial, Helvetica, sans-serif; font-size: 18px; font-weight: bold; fill: #333333; }
-    .axis-label { font-family: Arial, Helvetica, sans-serif; font-size: 12px; fill: #666666; }
-    .tick-label { font-family: Arial, Helvetica, sans-serif; font-size: 11px; fill: #666666; }
-    .bar-label-name { font-family: Arial, Helvetica, sans-serif; font-size: 12px; fill: #333333; }
-    .bar-label-value { font-family: monospace; font-size: 11px; fill: #555555; }
-    .bar-label-pct { font-family: Arial, Helvetica, sans-serif; font-size: 12px; font-weight: bold; fill: white; }
-    .metadata { font-family: monospace; font-size: 10px; fill: #666666; }
-    .grid-line { stroke: #cccccc; stroke-width: 0.5; }
-  </style>''')
+    # Escaped bar labels, computed up front so the bar loop only does layout
+    name_labels = [metadata.escape_xml(a) for a in allocators]
+    time_labels = [metadata.escape_xml(format_time(weighted_sums.get(a, 0))) for a in allocators]
+    pct_labels = ["baseline"] + [metadata.escape_xml(format_pct_diff(pct)) for pct in percentages[1:]]
 
     # Title
     base_title = "Performance of simd-json with different allocators"
     title = f"{base_title}{title_suffix}" if title_suffix else f"{base_title}—time (lower is better)"
-    svg_parts.append(f'  <text x="{svg_width / 2}" y="35" class="title" text-anchor="middle">{metadata.escape_xml(title)}</text>')
 
     # Y-axis label
     y_label = f"Time vs Baseline (%, baseline = {baseline_time_str})"
     y_label_y = margin_top + chart_height / 2
-    svg_parts.append(f'  <text x="20" y="{y_label_y}" class="axis-label" text-anchor="middle" transform="rotate(-90 20 {y_label_y})">{metadata.escape_xml(y_label)}</text>')
-
-    # Grid lines and ticks
-    y_ticks = [0, 20, 40, 60, 80, 100]
-    if y_max > 100:
-        # Add ticks up to y_max in increments of 20
-        tick = 120
-        while tick <= y_max:
-            y_ticks.append(tick)
-            tick += 20
-
-    for tick in y_ticks:
-        if tick > y_max:
-            continue
-        y_pos = margin_top + chart_height - (tick / y_max * chart_height)
-        svg_parts.append(f'  <line x1="{margin_left}" y1="{y_pos}" x2="{margin_left + chart_width}" y2="{y_pos}" class="grid-line"/>')
-        svg_parts.append(f'  <text x="{margin_left - 10}" y="{y_pos + 4}" class="tick-label" text-anchor="end">{tick}%</text>')
-
-    # Bars
-    for i, (allocator, pct) in enumerate(zip(allocators, percentages)):
-        color = metadata.get_color(allocator)
-        bar_x = margin_left + i * bar_spacing + (bar_spacing - bar_width) / 2
-        bar_height = (pct / y_max) * chart_height
-        bar_y = margin_top + chart_height - bar_height
-
-        path = rounded_rect_path(bar_x, bar_y, bar_width, bar_height, corner_radius)
-        svg_parts.append(f'  <path d="{path}" fill="{color}"/>')
-
-        name_x = bar_x + bar_width / 2
-        svg_parts.append(f'  <text x="{name_x}" y="{margin_top + chart_height + 20}" class="bar-label-name" text-anchor="middle">{metadata.escape_xml(allocator)}</text>')
-
-        time_label = format_time(weighted_sums.get(allocator, 0))
-        svg_parts.append(f'  <text x="{name_x}" y="{bar_y - 8}" class="bar-label-value" text-anchor="middle">{metadata.escape_xml(time_label)}</text>')
-
-        pct_label = "baseline" if allocator == allocators[0] else format_pct_diff(pct / 100.0)
-        if bar_height > 35:
-            svg_parts.append(f'  <text x="{name_x}" y="{bar_y + 18}" class="bar-label-pct" text-anchor="middle">{metadata.escape_xml(pct_label)}</text>')
-
-    metadata.add_svg_metadata(metadata_dict, svg_height - 50, svg_parts, svg_width)
-    
-    svg_parts.append('</svg>')
 
+    # Stream fragments straight to the file instead of collecting them first
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(svg_parts))
+        write = f.write
+
+        # Everything up to the grid is fixed, so write it as one block
+        write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {svg_width} {svg_height}" width="{svg_width}" height="{svg_height}">\n'
+            f'  <rect width="{svg_width}" height="{svg_height}" fill="white"/>\n'
+            f'{_SVG_STYLE}'
+            f'  <text x="{svg_width / 2:.0f}" y="35" class="title" text-anchor="middle">{metadata.escape_xml(title)}</text>\n'
+            f'  <text x="20" y="{y_label_y:.0f}" class="axis-label" text-anchor="middle" transform="rotate(-90 20 {y_label_y:.0f})">{metadata.escape_xml(y_label)}</text>\n'
+        )
+
+        # Grid lines and ticks
+        y_ticks = [0, 20, 40, 60, 80, 100]
+        if y_max > 100:
+            # Add ticks up to y_max in increments of 20
+            tick = 120
+            while tick <= y_max:
+                y_ticks.append(tick)
+                tick += 20
+
+        # Only y varies per tick, so format the x coordinates once
+        grid_left_s = str(margin_left)
+        grid_right_s = str(chart_right)
+        tick_label_x_s = str(margin_left - 10)
+        for tick in y_ticks:
+            if tick > y_max:
+                continue
+            y_pos = chart_bottom - (tick / y_max * chart_height)
+            y_pos_s = f"{y_pos:.0f}"
+            write(
+                f'  <line x1="{grid_left_s}" y1="{y_pos_s}" x2="{grid_right_s}" y2="{y_pos_s}" class="grid-line"/>\n'
+                f'  <text x="{tick_label_x_s}" y="{y_pos + 4:.0f}" class="tick-label" text-anchor="end">{tick}%</text>\n'
+            )
+
+        # Bars
+        name_label_y_s = str(chart_bottom + 20)
+        for i, (allocator, pct) in enumerate(zip(allocators, percentages)):
+            color = metadata.get_color(allocator)
+            bar_x = margin_left + i * bar_spacing + (bar_spacing - bar_width) / 2
+            bar_height = (pct / y_max) * chart_height
+            bar_y = chart_bottom - bar_height
+
+            path = rounded_rect_path(bar_x, bar_y, bar_width, bar_height, corner_radius)
+            name_x = bar_x + bar_width / 2
+            write(_SVG_BAR_TEMPLATE % (
+                path, color,
+                name_x, name_label_y_s, name_labels[i],
+                name_x, bar_y - 8, time_labels[i],
+            ))
+
+            if bar_height > 35:
+                write(_SVG_BAR_PCT_TEMPLATE % (name_x, bar_y + 18, pct_labels[i]))
+
+        metadata_parts: list[str] = []
+        metadata.add_svg_metadata(metadata_dict, svg_height - 50, metadata_parts, svg_width)
+        f.writelines(metadata_parts)
+
+        write('</svg>\n')
 
     print(f"\nGraph saved to: {output_file}")
 
@@ -345,16 +507,17 @@ def main():
     all_results: dict[str, dict[str, float]] = {}
     allocators: list[str] = []
 
-    for filepath in args.files:
-        # Extract allocator name from filename (e.g., "tmp/default" -> "default")
-        allocator_name = filepath.rsplit('/', 1)[-1].replace('.txt', '').replace('.bench', '')
+    # Each file is parsed independently, so overlap the reads and scans
+    with ThreadPoolExecutor(max_workers=min(8, len(args.files))) as executor:
+        parsed_files = list(executor.map(parse_file, args.files))
+
+    for filepath, results in zip(args.files, parsed_files):
+        allocator_name = get_allocator_name(filepath)
         allocators.append(allocator_name)
-        all_results[allocator_name] = parse_file(filepath)
+        all_results[allocator_name] = results
 
     # Get all unique test names
-    all_tests: set[str] = set()
-    for results in all_results.values():
-        all_tests.update(results.keys())
+    all_tests: set[str] = set().union(*all_results.values())
 
     # Sort tests by weight (descending) then name
     sorted_tests = sorted(all_tests, key=lambda t: (-get_weight(t), t))
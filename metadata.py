@@ -13,18 +13,16 @@ UNKNOWN_ALLOCATOR_COLOR = '#9e9e9e'  # gray
 
 # Canonical allocator ordering
 ALLOCATOR_ORDER = ['default', 'jemalloc', 'snmalloc', 'mimalloc', 'rpmalloc', 'smalloc']
+_ALLOCATOR_RANK = {name: i for i, name in enumerate(ALLOCATOR_ORDER)}
+# Unknown allocators sort just before smalloc
+_UNKNOWN_ALLOCATOR_RANK = _ALLOCATOR_RANK['smalloc'] - 0.5
 
 def get_color(name):
     return ALLOCATOR_COLORS.get(name, UNKNOWN_ALLOCATOR_COLOR)
 
 def sort_allocators(names):
     """Sort allocator names in canonical order: default, known allocators, unknown, smalloc last."""
-    def sort_key(name):
-        if name in ALLOCATOR_ORDER:
-            return (0, ALLOCATOR_ORDER.index(name))
-        else:
-            return (0, ALLOCATOR_ORDER.index('smalloc') - 0.5)
-    return sorted(names, key=sort_key)
+    return sorted(names, key=lambda name: _ALLOCATOR_RANK.get(name, _UNKNOWN_ALLOCATOR_RANK))
 
 def allocator_prefix_to_name(name):
     allocator_map = {
@@ -48,9 +46,11 @@ def add_parse_args(parser):
     parser.add_argument('--os', help='OS type')
     parser.add_argument('--cpu-count', help='Number of CPUs')
 
+_XML_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
 def escape_xml(text):
     """Escape special XML characters."""
-    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+    return text.translate(_XML_ESCAPES)
 
 def add_svg_metadata(args, metadata_y, svg_parts, svg_width):
     line0_parts = []
@@ -78,10 +78,10 @@ def add_svg_metadata(args, metadata_y, svg_parts, svg_width):
         line3_parts.append(f"CPU count: {args.cpu_count}")
 
     if line0_parts:
-        svg_parts.append(f'  <text x="{svg_width/2}" y="{metadata_y}" class="metadata" text-anchor="middle">{escape_xml(" · ".join(line0_parts))}</text>\n')
+        svg_parts.append(f'  <text x="{svg_width/2:.0f}" y="{metadata_y}" class="metadata" text-anchor="middle">{escape_xml(" · ".join(line0_parts))}</text>\n')
     if line1_parts:
-        svg_parts.append(f'  <text x="{svg_width/2}" y="{metadata_y + 14}" class="metadata" text-anchor="middle">{" · ".join(line1_parts)}</text>\n')
+        svg_parts.append(f'  <text x="{svg_width/2:.0f}" y="{metadata_y + 14}" class="metadata" text-anchor="middle">{" · ".join(line1_parts)}</text>\n')
     if line2_parts:
-        svg_parts.append(f'  <text x="{svg_width/2}" y="{metadata_y + 28}" class="metadata" text-anchor="middle">{" · ".join(line2_parts)}</text>\n')
+        svg_parts.append(f'  <text x="{svg_width/2:.0f}" y="{metadata_y + 28}" class="metadata" text-anchor="middle">{" · ".join(line2_parts)}</text>\n')
     if line3_parts:
-        svg_parts.append(f'  <text x="{svg_width/2}" y="{metadata_y + 42}" class="metadata" text-anchor="middle">{" · ".join(line3_parts)}</text>\n')
+        svg_parts.append(f'  <text x="{svg_width/2:.0f}" y="{metadata_y + 42}" class="metadata" text-anchor="middle">{" · ".join(line3_parts)}</text>\n')